@@ -8,6 +8,8 @@ import streamlit as st
 from dotenv import load_dotenv
 from langgraph.prebuilt import tools_condition
 from utils.visualize import visualize_graph_in_streamlit
+from utils.prompt_cache import cache_usage
+from utils.chat_history import render_chat_history, render_turn_metrics
 from graph_state import State
 from nodes.superviser import tool_node, superviser
 # from nodes.determine_intent import determine_intent, router
@@ -67,14 +69,8 @@ if "messages" not in st.session_state:
 #     import uuid
 #     st.session_state.thread_id = str(uuid.uuid4())
 
-# 이전 메시지 표시
-for message in st.session_state.messages:
-    if isinstance(message, HumanMessage):
-        with st.chat_message("user"):
-            st.write(message.content)
-    else:
-        with st.chat_message("assistant"):
-            st.write(message.content)
+# 이전 메시지 표시 (최근 메시지만 렌더링, 이전 메시지는 페이지 단위로 불러옴)
+render_chat_history(st.session_state.messages)
 
 # 사용자 입력 처리
 if prompt := st.chat_input("메시지를 입력하세요"):
@@ -88,6 +84,9 @@ if prompt := st.chat_input("메시지를 입력하세요"):
     with st.chat_message("assistant"):
         message_placeholder = st.empty()
         TOOL_STATUS = None
+        # 턴 단위 토큰 사용량 (프롬프트 캐시 읽기/쓰기 포함)
+        turn_metrics = {"calls": 0, "input_tokens": 0, "cache_read": 0, "cache_creation": 0}
+        answer_index = None
 
         with st.spinner("생각중..."):
             # 스트리밍 응답 처리
@@ -100,6 +99,10 @@ if prompt := st.chat_input("메시지를 입력하세요"):
                         # 새로운 메시지 내용 추출
                         new_content = value["messages"][-1]
 
+                        if isinstance(new_content, AIMessage):
+                            turn_metrics["calls"] += 1
+                            for metric, tokens in cache_usage(new_content).items():
+                                turn_metrics[metric] += tokens
 
                         # 중간메시지
                         if isinstance(new_content, AIMessage) and isinstance(new_content.content, list) and new_content.content:
@@ -115,6 +118,8 @@ if prompt := st.chat_input("메시지를 입력하세요"):
                                     TOOL_STATUS = f"{call["name"]}사용해서 주식데이터 가져옴"
                                 elif call["name"] == "Technical_Analysis":
                                     TOOL_STATUS = f"{call["name"]}사용해서 주식데이터 분석함"
+                                elif call["name"] == "Portfolio_Analysis":
+                                    TOOL_STATUS = f"{call["name"]}사용해서 포트폴리오 상관관계 분석함"
                         elif isinstance(new_content, ToolMessage):
                             if TOOL_STATUS:
                                 with st.status(TOOL_STATUS):
@@ -124,5 +129,11 @@ if prompt := st.chat_input("메시지를 입력하세요"):
                             # 결과에서 AI 응답 추출 및 표시
                             ai_message = new_content
                             st.session_state.messages.append(ai_message)
+                            answer_index = len(st.session_state.messages) - 1
+
+        # 토큰 사용량을 답변 메시지 인덱스로 저장해 이후 대화 기록에서도 표시
+        if answer_index is not None:
+            st.session_state.setdefault("turn_metrics", {})[answer_index] = turn_metrics
+        render_turn_metrics(turn_metrics)
 
     
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+# 저장소 루트의 모듈(tools, nodes, utils)을 테스트에서 바로 임포트할 수 있도록 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: 실행 시간을 측정하는 테스트 (RUN_BENCHMARKS=1일 때만 실행)")
+
+
+def pytest_collection_modifyitems(config, items):
+    # 실행 시간 검사는 CI 부하에 따라 흔들리므로 기본적으로 건너뜀
+    if os.environ.get("RUN_BENCHMARKS") == "1":
+        return
+    skip = pytest.mark.skip(reason="RUN_BENCHMARKS=1일 때만 실행")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
@@ -0,0 +1,85 @@
+import time
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from utils.chat_history import HISTORY_PAGE_SIZE
+
+
+def chat_app(n_messages: int) -> None:
+    '''n_messages개의 대화 기록(긴 도구 표 포함)을 렌더링하는 Streamlit 앱'''
+    import streamlit as st
+    from langchain_core.messages import AIMessage, HumanMessage
+    from utils.chat_history import render_chat_history
+
+    if "messages" not in st.session_state:
+        table = "| 지표 | 값 |\n|---|---|\n" + "| RSI | 55.2 |\n" * 300
+        st.session_state.messages = [
+            HumanMessage(f"질문 {i}") if i % 2 == 0 else AIMessage(f"답변 {i}\n\n{table}")
+            for i in range(n_messages)
+        ]
+    render_chat_history(st.session_state.messages)
+
+
+def run_app(n_messages: int) -> AppTest:
+    at = AppTest.from_function(chat_app, args=(n_messages,), default_timeout=30)
+    at.run()
+    return at
+
+
+def rerun_time(at: AppTest, repeats: int = 5) -> float:
+    '''세션 상태가 채워진 뒤 재실행 시간의 중앙값(초)'''
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        at.run()
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2]
+
+
+def test_renders_only_latest_page():
+    at = run_app(500)
+
+    assert len(at.chat_message) == HISTORY_PAGE_SIZE
+    assert at.button[0].label.startswith(f"이전 메시지 {500 - HISTORY_PAGE_SIZE}개")
+    # 긴 답변은 미리보기만 렌더링
+    assert len(at.toggle) == HISTORY_PAGE_SIZE // 2
+
+
+def test_load_more_and_expand():
+    at = run_app(500)
+
+    at.button[0].click().run()
+    assert len(at.chat_message) == 2 * HISTORY_PAGE_SIZE
+
+    preview_length = sum(len(m.value) for m in at.markdown)
+    at.toggle[0].set_value(True).run()
+    assert sum(len(m.value) for m in at.markdown) > preview_length
+
+
+@pytest.mark.parametrize("n_messages", [20, 100, 500])
+def test_rendered_elements_stay_flat(n_messages):
+    at = run_app(n_messages)
+
+    # 렌더링 작업은 대화 길이와 무관하게 한 페이지 분량으로 제한됨
+    assert len(at.chat_message) == HISTORY_PAGE_SIZE
+    assert len(at.markdown) == HISTORY_PAGE_SIZE
+    assert len(at.button) == (1 if n_messages > HISTORY_PAGE_SIZE else 0)
+
+
+@pytest.mark.benchmark
+def test_render_time_stays_flat_up_to_500_messages():
+    timings = {n: rerun_time(run_app(n)) for n in (20, 100, 500)}
+    print("재실행 시간(초):", timings)
+
+    # 대화 길이가 25배 늘어도 재실행 시간은 거의 같아야 함
+    assert timings[500] < timings[20] * 2 + 0.05, timings
+
+
+def test_turn_metrics_shown_with_past_answers():
+    at = AppTest.from_function(chat_app, args=(4,), default_timeout=30)
+    at.session_state["turn_metrics"] = {3: {"calls": 2, "input_tokens": 4512, "cache_read": 3000, "cache_creation": 1500}}
+    at.run()
+
+    assert [c.value for c in at.chat_message[1].caption] == []
+    assert [c.value for c in at.chat_message[3].caption] == ["LLM 호출 2회 · 입력 토큰 4,512 (캐시 읽기 3,000 / 캐시 쓰기 1,500)"]
@@ -0,0 +1,172 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools import portfolio_analysis
+from tools.portfolio_analysis import TRADING_DAYS, analyze_returns
+
+
+@pytest.fixture
+def market():
+    '''공통 요인을 공유하는 합성 일간 수익률 (T x N)과 벤치마크 수익률'''
+    rng = np.random.default_rng(0)
+    benchmark = rng.normal(0.0005, 0.01, size=252)
+    loadings = rng.uniform(0.5, 1.5, size=8)
+    returns = benchmark[:, None] * loadings + rng.normal(0, 0.01, size=(252, 8))
+    weights = np.full(8, 1 / 8)
+    return returns, weights, benchmark
+
+
+def test_covariance_and_correlation_match_numpy(market):
+    returns, weights, benchmark = market
+    result = analyze_returns(returns, weights, benchmark)
+
+    np.testing.assert_allclose(result["covariance"], np.cov(returns, rowvar=False) * TRADING_DAYS)
+    np.testing.assert_allclose(result["correlation"], np.corrcoef(returns, rowvar=False))
+    expected_vol = np.sqrt(weights @ np.cov(returns, rowvar=False) @ weights * TRADING_DAYS)
+    assert result["portfolio_volatility"] == pytest.approx(expected_vol)
+
+
+def test_beta_matches_cov_over_var(market):
+    returns, weights, benchmark = market
+    result = analyze_returns(returns, weights, benchmark)
+
+    expected = [np.cov(returns[:, i], benchmark)[0, 1] / np.var(benchmark, ddof=1) for i in range(returns.shape[1])]
+    np.testing.assert_allclose(result["beta"], expected)
+    assert result["portfolio_beta"] == pytest.approx(weights @ np.array(expected))
+
+
+def test_beta_skipped_without_benchmark(market):
+    returns, weights, _ = market
+    result = analyze_returns(returns, weights)
+
+    assert result["beta"] is None
+    assert result["portfolio_beta"] is None
+    assert result["rolling_correlation_target"] == "portfolio"
+
+
+def test_rolling_correlation_matches_naive_window(market):
+    returns, weights, benchmark = market
+    window = 20
+    result = analyze_returns(returns, weights, benchmark, rolling_window=window)
+    rolling = result["rolling_correlation"]
+
+    assert result["rolling_correlation_target"] == "benchmark"
+    assert rolling.shape == (returns.shape[0] - window + 1, returns.shape[1])
+    for end in (window, 100, returns.shape[0]):
+        for i in range(returns.shape[1]):
+            expected = np.corrcoef(returns[end - window:end, i], benchmark[end - window:end])[0, 1]
+            assert rolling[end - window, i] == pytest.approx(expected, abs=1e-8)
+
+
+def test_rolling_correlation_skipped_for_short_history(market):
+    returns, weights, benchmark = market
+    result = analyze_returns(returns[:10], weights, benchmark[:10], rolling_window=20)
+
+    assert result["rolling_correlation"] is None
+    assert result["rolling_correlation_target"] is None
+
+
+def test_max_drawdown_counts_first_day_loss():
+    returns = np.array([[-0.2, 0.1], [0.0, -0.5], [0.1, 0.0]])
+    result = analyze_returns(returns, np.array([1.0, 0.0]))
+
+    np.testing.assert_allclose(result["max_drawdown"], [-0.2, -0.5])
+    assert result["portfolio_max_drawdown"] == pytest.approx(-0.2)
+
+
+@pytest.mark.parametrize("window", [1, 0, -5, 300])
+def test_rolling_correlation_skipped_for_invalid_window(market, window):
+    returns, weights, benchmark = market
+    result = analyze_returns(returns, weights, benchmark, rolling_window=window)
+
+    assert result["rolling_correlation"] is None
+    assert result["rolling_correlation_target"] is None
+
+
+@pytest.mark.benchmark
+def test_analyze_returns_scales_to_hundreds_of_symbols():
+    rng = np.random.default_rng(1)
+    returns = rng.normal(0, 0.01, size=(252, 500))
+    benchmark = rng.normal(0, 0.01, size=252)
+    weights = np.full(500, 1 / 500)
+
+    start = time.perf_counter()
+    result = analyze_returns(returns, weights, benchmark)
+    elapsed = time.perf_counter() - start
+
+    assert result["correlation"].shape == (500, 500)
+    assert elapsed < 1.0
+
+
+@pytest.fixture
+def stub_prices(monkeypatch):
+    '''yfinance 대신 합성 종가를 돌려주도록 가격 조회를 교체 (FLAT은 가격 변동 없음)'''
+    rng = np.random.default_rng(2)
+    dates = pd.bdate_range("2024-01-01", periods=120)
+    prices = pd.DataFrame(
+        {
+            "AAA": 100 * np.cumprod(1 + rng.normal(0, 0.01, 120)),
+            "BBB": 50 * np.cumprod(1 + rng.normal(0, 0.01, 120)),
+            "FLAT": np.full(120, 10.0),
+            "SPY": 400 * np.cumprod(1 + rng.normal(0, 0.01, 120)),
+            "^GSPC": 4000 * np.cumprod(1 + rng.normal(0, 0.01, 120)),
+        },
+        index=dates,
+    )
+    monkeypatch.setattr(portfolio_analysis, "_fetch_close_prices", lambda symbols, period: prices.reindex(columns=symbols))
+    return prices
+
+
+def test_tool_skips_nan_pairs_and_reports_rolling_target(stub_prices):
+    result = portfolio_analysis.portfolio_analysis_tool(["AAA", "BBB", "FLAT"], rolling_window=30)
+
+    assert "error" not in result
+    pairs = result["most_correlated_pairs"] + result["least_correlated_pairs"]
+    assert pairs and all(np.isfinite(p["correlation"]) for p in pairs)
+    assert all("FLAT" not in p["pair"] for p in pairs)
+    assert np.isfinite(result["average_correlation"])
+    assert result["rolling_correlation_target"] == "^GSPC"
+    assert result["rolling_window"] == 30
+
+
+@pytest.mark.parametrize("window", [1, 0, -5])
+def test_tool_rejects_invalid_rolling_window(stub_prices, window):
+    result = portfolio_analysis.portfolio_analysis_tool(["AAA", "BBB"], rolling_window=window)
+
+    assert set(result) == {"error"}
+
+
+def test_tool_uses_benchmark_that_is_also_a_holding(stub_prices):
+    result = portfolio_analysis.portfolio_analysis_tool(["AAA", "BBB", "SPY"], benchmark=" spy ")
+
+    assert result["benchmark"] == "SPY"
+    assert result["benchmark_missing"] is False
+    assert result["portfolio"]["beta"] is not None
+    assert result["per_symbol"]["SPY"]["beta"] == pytest.approx(1.0)
+    assert result["rolling_correlation_target"] == "SPY"
+
+
+def test_tool_reports_missing_benchmark(stub_prices):
+    result = portfolio_analysis.portfolio_analysis_tool(["AAA", "BBB"], benchmark="NOPE")
+
+    assert result["benchmark"] == "NOPE"
+    assert result["benchmark_missing"] is True
+    assert result["portfolio"]["beta"] is None
+    assert result["rolling_correlation_target"] == "portfolio"
+
+
+def test_tool_sums_weights_of_duplicate_symbols(stub_prices):
+    result = portfolio_analysis.portfolio_analysis_tool(["AAA", "aaa", " ", "BBB"], weights=[1, 1, 5, 2])
+
+    assert result["symbols"] == ["AAA", "BBB"]
+    assert result["per_symbol"]["AAA"]["weight"] == pytest.approx(0.5)
+    assert result["per_symbol"]["BBB"]["weight"] == pytest.approx(0.5)
+
+
+def test_tool_checks_weight_count_against_given_symbols(stub_prices):
+    result = portfolio_analysis.portfolio_analysis_tool(["AAPL", "aapl", "MSFT"], weights=[1, 2])
+
+    assert result == {"error": "비중 개수(2)가 심볼 개수(3)와 일치하지 않습니다."}
@@ -0,0 +1,131 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from langchain_anthropic import ChatAnthropic
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from nodes import superviser as superviser_node
+from utils.prompt_cache import EPHEMERAL, cache_usage
+
+# 캐시 읽기/쓰기 토큰이 포함된 Anthropic Messages API 응답
+FAKE_RESPONSE = {
+    "id": "msg_test",
+    "type": "message",
+    "role": "assistant",
+    "model": "claude-3-5-haiku-20241022",
+    "content": [{"type": "text", "text": "분석 결과입니다."}],
+    "stop_reason": "end_turn",
+    "stop_sequence": None,
+    "usage": {
+        "input_tokens": 12,
+        "output_tokens": 7,
+        "cache_creation_input_tokens": 1500,
+        "cache_read_input_tokens": 3000,
+    },
+}
+
+
+@pytest.fixture
+def fake_anthropic():
+    '''요청 본문을 기록하고 고정 응답을 돌려주는 로컬 Anthropic API 엔드포인트'''
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers["Content-Length"])
+            requests.append(json.loads(self.rfile.read(length)))
+            body = json.dumps(FAKE_RESPONSE).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", requests
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def superviser_payload(fake_anthropic, monkeypatch):
+    '''superviser 노드가 가짜 엔드포인트로 보낸 요청 본문을 반환하는 함수'''
+    base_url, requests = fake_anthropic
+    # 노드에 바인딩된 도구 스키마(kwargs)를 그대로 사용하고 엔드포인트만 교체
+    llm = ChatAnthropic(
+        model="claude-3-5-haiku-20241022",
+        base_url=base_url,
+        api_key="test-key",
+        max_retries=0,
+    ).bind(**superviser_node.llm.kwargs)
+    monkeypatch.setattr(superviser_node, "llm", llm)
+
+    def run(messages):
+        result = superviser_node.superviser({"messages": messages})
+        assert len(requests) == 1
+        return requests[0], result["messages"][0]
+
+    return run
+
+
+def test_system_prompt_is_cached(superviser_payload):
+    payload, _ = superviser_payload([HumanMessage("AAPL 분석해줘")])
+
+    assert payload["system"][0]["text"] == superviser_node.system_prompt
+    assert payload["system"][0]["cache_control"] == EPHEMERAL
+
+
+def test_only_last_tool_is_cached(superviser_payload):
+    payload, _ = superviser_payload([HumanMessage("AAPL 분석해줘")])
+
+    tools = payload["tools"]
+    assert [tool["name"] for tool in tools] == [tool.name for tool in superviser_node.tools]
+    assert tools[-1]["cache_control"] == EPHEMERAL
+    assert all("cache_control" not in tool for tool in tools[:-1])
+
+
+def test_human_turn_is_cached(superviser_payload):
+    payload, _ = superviser_payload([HumanMessage("AAPL 분석해줘")])
+
+    last = payload["messages"][-1]
+    assert last["role"] == "user"
+    assert last["content"][-1] == {"type": "text", "text": "AAPL 분석해줘", "cache_control": EPHEMERAL}
+
+
+def test_tool_result_turn_is_cached(superviser_payload):
+    messages = [
+        HumanMessage("AAPL 분석해줘"),
+        AIMessage("", tool_calls=[{"name": "Technical_Analysis", "args": {"query": "AAPL"}, "id": "toolu_1"}]),
+        ToolMessage('{"signal": "중립적 신호"}', tool_call_id="toolu_1"),
+    ]
+    payload, _ = superviser_payload(messages)
+
+    first, last = payload["messages"][0], payload["messages"][-1]
+    assert last["role"] == "user"
+    assert last["content"][-1]["type"] == "tool_result"
+    assert last["content"][-1]["tool_use_id"] == "toolu_1"
+    assert last["content"][-1]["cache_control"] == EPHEMERAL
+    # 캐시 지점은 마지막 메시지에만 표시되고 그래프 상태는 그대로 유지
+    assert first["content"] == "AAPL 분석해줘"
+    assert messages[-1].content == '{"signal": "중립적 신호"}'
+
+
+def test_cache_usage_reads_cache_tokens(superviser_payload):
+    _, response = superviser_payload([HumanMessage("AAPL 분석해줘")])
+
+    assert cache_usage(response) == {
+        "input_tokens": 12 + 1500 + 3000,
+        "cache_read": 3000,
+        "cache_creation": 1500,
+    }
+
+
+def test_cache_usage_without_usage_metadata():
+    assert cache_usage(HumanMessage("hi")) == {"input_tokens": 0, "cache_read": 0, "cache_creation": 0}
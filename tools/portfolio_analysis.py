@@ -0,0 +1,268 @@
+from langchain.tools import StructuredTool
+from typing import Dict, Any, List, Optional
+import numpy as np
+import yfinance as yf
+
+# 연간 거래일 수 (연율화에 사용)
+TRADING_DAYS = 252
+# 상관계수 행렬 전체를 결과에 포함할 최대 종목 수 (그 이상은 상/하위 쌍만 요약)
+MAX_MATRIX_SYMBOLS = 10
+# 요약에 포함할 상관계수 상/하위 쌍 개수
+TOP_PAIRS = 5
+
+
+def _fetch_close_prices(symbols: List[str], period: str):
+    '''여러 종목의 종가를 한 번의 요청으로 가져와 날짜 기준으로 정렬합니다.'''
+    data = yf.download(symbols, period=period, auto_adjust=True, progress=False, group_by="column")
+    close = data["Close"]
+    # 단일 종목인 경우 Series가 반환되므로 DataFrame으로 맞춰줌
+    if close.ndim == 1:
+        close = close.to_frame(name=symbols[0])
+    return close.reindex(columns=symbols)
+
+
+def _max_drawdown(returns: np.ndarray) -> np.ndarray:
+    '''수익률 행렬(T x N)에서 각 열의 최대 낙폭을 계산합니다.'''
+    # 시작 자산(1.0)을 첫 행으로 두어 첫날 손실도 낙폭에 포함
+    start = np.ones((1, returns.shape[1]))
+    wealth = np.cumprod(np.vstack([start, 1.0 + returns]), axis=0)
+    peak = np.maximum.accumulate(wealth, axis=0)
+    return (wealth / peak - 1.0).min(axis=0)
+
+
+def _rolling_correlation(returns: np.ndarray, target: np.ndarray, window: int) -> np.ndarray:
+    '''각 열과 target 사이의 이동 상관계수를 누적합으로 한 번에 계산합니다. (T-window+1 x N)'''
+    x = returns
+    y = target[:, None]
+
+    def window_sum(a: np.ndarray) -> np.ndarray:
+        c = np.cumsum(np.vstack([np.zeros((1, a.shape[1])), a]), axis=0)
+        return c[window:] - c[:-window]
+
+    sx, sy = window_sum(x), window_sum(y)
+    sxx, syy, sxy = window_sum(x * x), window_sum(y * y), window_sum(x * y)
+
+    cov = sxy - sx * sy / window
+    var_x = sxx - sx * sx / window
+    var_y = syy - sy * sy / window
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return cov / np.sqrt(var_x * var_y)
+
+
+def analyze_returns(
+    returns: np.ndarray,
+    weights: np.ndarray,
+    benchmark_returns: Optional[np.ndarray] = None,
+    rolling_window: int = 60,
+) -> Dict[str, Any]:
+    '''
+    정렬된 일간 수익률 행렬로 포트폴리오 지표를 계산합니다.
+
+    Args:
+        returns: 일간 수익률 행렬 (T x N)
+        weights: 종목별 비중 (합이 1인 길이 N 벡터)
+        benchmark_returns: 벤치마크 지수의 일간 수익률 (길이 T), 없으면 베타를 계산하지 않음
+        rolling_window: 이동 상관계수 계산 기간 (일), 2 이상 T 이하일 때만 계산
+
+    Returns:
+        Dict: 공분산/상관계수 행렬(numpy 배열)과 포트폴리오 위험 지표
+    '''
+    n_obs = returns.shape[0]
+
+    # 공분산 및 상관계수 행렬 (연율화)
+    centered = returns - returns.mean(axis=0)
+    cov = centered.T @ centered / (n_obs - 1) * TRADING_DAYS
+    std = np.sqrt(np.diag(cov))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = cov / np.outer(std, std)
+    np.fill_diagonal(corr, 1.0)
+
+    # 포트폴리오 수익률과 변동성
+    portfolio_returns = returns @ weights
+    portfolio_volatility = float(np.sqrt(weights @ cov @ weights))
+
+    result = {
+        "covariance": cov,
+        "correlation": corr,
+        "volatility": std,
+        "portfolio_volatility": portfolio_volatility,
+        "portfolio_return": float(np.prod(1.0 + portfolio_returns) - 1.0),
+        "max_drawdown": _max_drawdown(returns),
+        "portfolio_max_drawdown": float(_max_drawdown(portfolio_returns[:, None])[0]),
+        "beta": None,
+        "portfolio_beta": None,
+        "rolling_correlation": None,
+        "rolling_correlation_target": None,
+    }
+
+    # 벤치마크 대비 베타: cov(r_i, r_b) / var(r_b)
+    if benchmark_returns is not None:
+        bench_centered = benchmark_returns - benchmark_returns.mean()
+        bench_var = bench_centered @ bench_centered
+        betas = centered.T @ bench_centered / bench_var
+        result["beta"] = betas
+        result["portfolio_beta"] = float(weights @ betas)
+
+    # 종목별 포트폴리오(또는 벤치마크)와의 이동 상관계수
+    if 2 <= rolling_window <= n_obs:
+        if benchmark_returns is not None:
+            target, result["rolling_correlation_target"] = benchmark_returns, "benchmark"
+        else:
+            target, result["rolling_correlation_target"] = portfolio_returns, "portfolio"
+        result["rolling_correlation"] = _rolling_correlation(returns, target, rolling_window)
+
+    return result
+
+
+def portfolio_analysis_tool(
+    symbols: List[str],
+    weights: Optional[List[float]] = None,
+    benchmark: str = "^GSPC",
+    period: str = "1y",
+    rolling_window: int = 60,
+) -> Dict[str, Any]:
+    '''
+    여러 주식으로 구성된 포트폴리오의 상관관계와 위험도를 분석합니다.
+
+    Args:
+        symbols: 분석할 주식 심볼 목록 (예: ["AAPL", "MSFT", "GOOGL"])
+        weights: 종목별 비중 (생략하면 동일 비중, 합이 1이 아니면 정규화)
+        benchmark: 베타 계산에 사용할 지수 심볼 (기본값: S&P 500)
+        period: 분석 기간 (예: "6mo", "1y", "2y")
+        rolling_window: 이동 상관계수 계산 기간 (일)
+
+    Returns:
+        Dict: 포트폴리오 변동성, 베타, 최대 낙폭, 상관관계 요약을 담은 딕셔너리
+    '''
+    if weights is not None and len(weights) != len(symbols):
+        return {"error": f"비중 개수({len(weights)})가 심볼 개수({len(symbols)})와 일치하지 않습니다."}
+
+    if rolling_window < 2:
+        return {"error": f"이동 상관계수 계산 기간은 2일 이상이어야 합니다. (입력값: {rolling_window})"}
+
+    # 심볼 정규화, 빈 심볼 제거, 중복 심볼의 비중은 합산
+    weight_map: Dict[str, float] = {}
+    raw_weights = weights if weights is not None else [1.0] * len(symbols)
+    for raw_symbol, weight in zip(symbols, raw_weights):
+        symbol = raw_symbol.strip().upper() if raw_symbol else ""
+        if symbol:
+            weight_map[symbol] = weight_map.get(symbol, 0.0) + float(weight)
+    symbols = list(weight_map)
+    if len(symbols) < 2:
+        return {"error": "포트폴리오 분석에는 최소 2개의 주식 심볼이 필요합니다. 예: AAPL, MSFT"}
+
+    benchmark = benchmark.strip().upper()
+
+    try:
+        prices = _fetch_close_prices(list(dict.fromkeys(symbols + ([benchmark] if benchmark else []))), period)
+
+        # 데이터가 없는 종목은 제외하고, 모든 종목에 값이 있는 날짜만 사용
+        available = [s for s in symbols if s in prices.columns and prices[s].notna().any()]
+        missing = [s for s in symbols if s not in available]
+        if len(available) < 2:
+            return {"error": "가격 데이터를 가져올 수 있는 종목이 2개 미만입니다.", "missing_symbols": missing}
+
+        # 벤치마크가 포트폴리오 종목이어도 별도 열로 사용
+        has_benchmark = bool(benchmark) and benchmark in prices.columns and prices[benchmark].notna().any()
+        columns = available + ([benchmark] if has_benchmark else [])
+        aligned = prices[columns].dropna()
+
+        if len(aligned) < 30:
+            return {"error": "충분한 과거 데이터가 없습니다.", "missing_symbols": missing}
+
+        values = aligned.to_numpy(dtype=float)
+        all_returns = values[1:] / values[:-1] - 1.0
+        n_assets = len(available)
+        returns = all_returns[:, :n_assets]
+        benchmark_returns = all_returns[:, n_assets] if has_benchmark else None
+
+        # 비중 정규화 (제외된 종목의 비중은 버림)
+        if weights is None:
+            w = np.full(n_assets, 1.0 / n_assets)
+        else:
+            w = np.array([weight_map[s] for s in available], dtype=float)
+            if w.sum() <= 0:
+                return {"error": "비중의 합은 0보다 커야 합니다."}
+            w = w / w.sum()
+
+        metrics = analyze_returns(returns, w, benchmark_returns, rolling_window)
+        corr = metrics["correlation"]
+
+        # 상관계수 상/하위 종목 쌍 (상삼각 행렬 기준, 가격 변동이 없어 NaN인 쌍은 제외)
+        upper_i, upper_j = np.triu_indices(n_assets, k=1)
+        pair_values = corr[upper_i, upper_j]
+        finite = np.flatnonzero(np.isfinite(pair_values))
+        order = finite[np.argsort(pair_values[finite])]
+
+        def to_pair(k: int) -> Dict[str, Any]:
+            return {
+                "pair": f"{available[upper_i[k]]}-{available[upper_j[k]]}",
+                "correlation": round(float(pair_values[k]), 4),
+            }
+
+        # 이동 상관계수 비교 대상 (벤치마크가 있으면 벤치마크, 없으면 포트폴리오)
+        if metrics["rolling_correlation_target"] == "benchmark":
+            rolling_target = benchmark
+        else:
+            rolling_target = metrics["rolling_correlation_target"]
+
+        per_symbol = {}
+        for idx, symbol in enumerate(available):
+            per_symbol[symbol] = {
+                "weight": round(float(w[idx]), 4),
+                "annual_volatility": round(float(metrics["volatility"][idx]), 4),
+                "max_drawdown": f"{metrics['max_drawdown'][idx] * 100:.2f}%",
+            }
+            if metrics["beta"] is not None:
+                per_symbol[symbol]["beta"] = round(float(metrics["beta"][idx]), 4)
+            if metrics["rolling_correlation"] is not None:
+                per_symbol[symbol]["rolling_correlation"] = round(float(metrics["rolling_correlation"][-1, idx]), 4)
+
+        analysis_result = {
+            "symbols": available,
+            "missing_symbols": missing,
+            "benchmark": benchmark or None,
+            # 벤치마크 가격 데이터가 없으면 베타를 계산하지 않음
+            "benchmark_missing": not has_benchmark,
+            "observations": int(returns.shape[0]),
+            "portfolio": {
+                "annual_volatility": round(metrics["portfolio_volatility"], 4),
+                "return": f"{metrics['portfolio_return'] * 100:.2f}%",
+                "max_drawdown": f"{metrics['portfolio_max_drawdown'] * 100:.2f}%",
+                "beta": round(metrics["portfolio_beta"], 4) if metrics["portfolio_beta"] is not None else None,
+            },
+            "average_correlation": round(float(pair_values[finite].mean()), 4) if finite.size else None,
+            "most_correlated_pairs": [to_pair(k) for k in order[::-1][:TOP_PAIRS]],
+            "least_correlated_pairs": [to_pair(k) for k in order[:TOP_PAIRS]],
+            "rolling_correlation_target": rolling_target,
+            "rolling_window": rolling_window,
+            "per_symbol": per_symbol,
+        }
+
+        # 종목 수가 적을 때만 전체 상관계수 행렬 포함
+        if n_assets <= MAX_MATRIX_SYMBOLS:
+            analysis_result["correlation_matrix"] = {
+                row: {col: round(float(corr[i, j]), 4) for j, col in enumerate(available)}
+                for i, row in enumerate(available)
+            }
+
+        return analysis_result
+
+    except Exception as e:
+        import traceback
+        error_details = traceback.format_exc()
+        return {"error": f"분석 중 오류 발생: {str(e)}", "error_details": error_details}
+
+
+# StructuredTool로 변환
+portfolio_analysis = StructuredTool.from_function(
+    name="Portfolio_Analysis",
+    func=portfolio_analysis_tool,
+    description="""
+    여러 주식으로 구성된 포트폴리오의 상관관계와 위험도를 분석합니다. 주식 심볼 목록과 선택적인 비중을 입력으로 받아
+    공분산/상관계수 행렬, 포트폴리오 변동성, 지수 대비 베타, 최대 낙폭, 이동 상관계수를 계산합니다.
+    "이 종목들이 얼마나 상관되어 있는지", "이 바스켓의 위험도가 어떤지" 같은 질문에 유용합니다.
+
+    입력 예시: symbols=["AAPL", "MSFT", "GOOGL"], weights=[0.5, 0.3, 0.2]
+    """,
+)
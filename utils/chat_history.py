@@ -0,0 +1,75 @@
+import streamlit as st
+from langchain_core.messages import BaseMessage, HumanMessage
+from typing import Any, Dict, List
+
+# 한 번에 표시할 이전 메시지 수 (더보기 버튼을 누를 때마다 이만큼 늘어남)
+HISTORY_PAGE_SIZE = 20
+# 이 길이를 넘는 메시지는 미리보기만 표시하고 펼칠 때 전체를 렌더링
+LARGE_MESSAGE_CHARS = 2000
+# 긴 메시지의 미리보기 길이
+PREVIEW_CHARS = 500
+
+
+def _message_text(content: Any) -> str:
+    '''메시지 content(문자열 또는 블록 리스트)에서 표시할 텍스트를 추출합니다.'''
+    if isinstance(content, str):
+        return content
+    parts = []
+    for block in content:
+        if isinstance(block, str):
+            parts.append(block)
+        elif isinstance(block, dict) and block.get("type") == "text":
+            parts.append(block.get("text", ""))
+    return "\n\n".join(parts)
+
+
+def render_turn_metrics(metrics: Dict[str, int]) -> None:
+    '''한 턴의 LLM 호출 수와 입력 토큰(프롬프트 캐시 읽기/쓰기 포함)을 표시합니다.'''
+    st.caption(
+        f"LLM 호출 {metrics['calls']}회 · 입력 토큰 {metrics['input_tokens']:,} "
+        f"(캐시 읽기 {metrics['cache_read']:,} / 캐시 쓰기 {metrics['cache_creation']:,})"
+    )
+
+
+def _render_message(index: int, message: BaseMessage) -> None:
+    text = _message_text(message.content)
+    with st.chat_message("user" if isinstance(message, HumanMessage) else "assistant"):
+        if len(text) <= LARGE_MESSAGE_CHARS:
+            st.markdown(text)
+        # 긴 메시지는 사용자가 펼칠 때만 전체 내용을 렌더링
+        elif st.toggle("전체 보기", key=f"history_expand_{index}"):
+            st.markdown(text)
+        else:
+            st.markdown(text[:PREVIEW_CHARS].rstrip() + " …")
+
+        # 답변 메시지에는 해당 턴의 토큰 사용량을 함께 표시
+        metrics = st.session_state.get("turn_metrics", {}).get(index)
+        if metrics:
+            render_turn_metrics(metrics)
+
+
+def _load_more_history() -> None:
+    st.session_state.history_limit += HISTORY_PAGE_SIZE
+
+
+@st.fragment
+def render_chat_history(messages: List[BaseMessage]) -> None:
+    '''
+    최근 메시지만 렌더링하고 이전 메시지는 더보기 버튼으로 페이지 단위로 불러옵니다.
+    fragment로 실행되므로 더보기/펼치기 조작 시 앱 전체가 아닌 대화 기록만 다시 그립니다.
+
+    Args:
+        messages: 표시할 대화 기록 (st.session_state.messages)
+    '''
+    limit = st.session_state.setdefault("history_limit", HISTORY_PAGE_SIZE)
+    start = max(0, len(messages) - limit)
+
+    if start > 0:
+        st.button(
+            f"이전 메시지 {start}개 중 {min(start, HISTORY_PAGE_SIZE)}개 더보기",
+            key="history_more",
+            on_click=_load_more_history,
+        )
+
+    for index in range(start, len(messages)):
+        _render_message(index, messages[index])
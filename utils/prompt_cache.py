@@ -0,0 +1,74 @@
+from typing import Any, Dict, List, Sequence
+from langchain_anthropic.chat_models import convert_to_anthropic_tool
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage, ToolMessage
+
+# Anthropic 프롬프트 캐싱에서 현재 지원하는 유일한 cache_control 값
+EPHEMERAL = {"type": "ephemeral"}
+
+
+def cached_tools(tools: Sequence[Any]) -> List[Dict[str, Any]]:
+    '''
+    도구 목록을 Anthropic 도구 스키마로 변환하고 마지막 도구에 캐시 지점을 표시합니다.
+    캐시는 접두사 단위이므로 마지막 도구에만 표시해도 전체 도구 정의가 캐시됩니다.
+    '''
+    schemas = [dict(convert_to_anthropic_tool(tool)) for tool in tools]
+    if schemas:
+        schemas[-1]["cache_control"] = EPHEMERAL
+    return schemas
+
+
+def cached_system_message(system_prompt: str) -> SystemMessage:
+    '''시스템 프롬프트를 캐시 지점이 표시된 SystemMessage로 만듭니다.'''
+    return SystemMessage(content=[{"type": "text", "text": system_prompt, "cache_control": EPHEMERAL}])
+
+
+def cached_messages(messages: Sequence[BaseMessage]) -> List[BaseMessage]:
+    '''
+    대화 기록의 마지막 메시지에 캐시 지점을 표시합니다.
+    같은 턴의 다음 호출은 이 지점까지의 접두사를 캐시에서 읽습니다.
+    원본 메시지(그래프 상태)는 수정하지 않고 복사본을 반환합니다.
+    '''
+    messages = list(messages)
+    if not messages:
+        return messages
+
+    last = messages[-1]
+    if isinstance(last, ToolMessage):
+        # 도구 결과는 tool_result 블록 자체에 cache_control을 붙여야 함
+        if isinstance(last.content, list) and last.content and all(
+            isinstance(block, dict) and block.get("type") == "tool_result" for block in last.content
+        ):
+            blocks = [dict(block) for block in last.content]
+        else:
+            blocks = [{
+                "type": "tool_result",
+                "content": last.content,
+                "tool_use_id": last.tool_call_id,
+                "is_error": last.status == "error",
+            }]
+        blocks[-1]["cache_control"] = EPHEMERAL
+        messages[-1] = last.model_copy(update={"content": blocks})
+    elif isinstance(last, HumanMessage):
+        if isinstance(last.content, str):
+            if not last.content.strip():
+                return messages
+            blocks = [{"type": "text", "text": last.content}]
+        else:
+            blocks = [block if isinstance(block, dict) else {"type": "text", "text": block} for block in last.content]
+            blocks = [dict(block) for block in blocks]
+        if blocks:
+            blocks[-1]["cache_control"] = EPHEMERAL
+            messages[-1] = last.model_copy(update={"content": blocks})
+
+    return messages
+
+
+def cache_usage(message: BaseMessage) -> Dict[str, int]:
+    '''AI 응답의 usage_metadata에서 캐시 읽기/쓰기 토큰 수를 추출합니다.'''
+    usage = getattr(message, "usage_metadata", None) or {}
+    details = usage.get("input_token_details") or {}
+    return {
+        "input_tokens": usage.get("input_tokens", 0) or 0,
+        "cache_read": details.get("cache_read", 0) or 0,
+        "cache_creation": details.get("cache_creation", 0) or 0,
+    }